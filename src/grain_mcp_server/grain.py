@@ -1,10 +1,13 @@
 import asyncio
 import logging
-import time
+import os
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from playwright.async_api import async_playwright
+import httpx
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Playwright, async_playwright
 
 from grain_mcp_server.parser import Meeting, parse_meetings
 
@@ -13,22 +16,77 @@ class Grain:
     BASE_URL = "https://grain.com/"
     MEETINGS_ENDPOINT = "app/meetings/all"
     TRANSCRIPTIONS_ENDPOINT_TEMPLATE = "_/cc/recording/%s/transcript.%s"
+    MEETINGS_LIST_SELECTOR = "#infinite-scrollable-div"
+    MEETING_ITEM_SELECTOR = '#infinite-scrollable-div a[data-cy="meeting-list-item"]'
+    # Meetings are read from the DOM only, so the meetings page skips these. Stylesheets are kept for the SPA layout
+    BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
 
-    def __init__(self, pw_cache_dir: str):
+    def __init__(self, pw_cache_dir: str, debug: bool = False, playwright: Optional[Playwright] = None):
         self.__pw_cache_dir = pw_cache_dir
+        self.__debug = debug
         self.__context = None
-        self.__playwright = None
+        # A Playwright instance passed in is shared with the caller, who is responsible for stopping it
+        self.__playwright = playwright
+        self.__owns_playwright = playwright is None
+        self.__login_lock = asyncio.Lock()
+        self.__logged_in = False
+        self.__http = None
+        # Clients replaced after a rejected session, closed on exit so in-flight downloads can finish
+        self.__stale_http = []
         self.__logger = logging.getLogger("grain-mcp-server")
 
     async def __login(self):
-        page = await self.__context.new_page()
-        await page.goto(Grain.BASE_URL + Grain.MEETINGS_ENDPOINT)
-        # Wait for page load and possible redirects
-        await page.wait_for_load_state("load", timeout=60000)  # 30 seconds timeout
-        await asyncio.sleep(2)  # Additional time for any dynamic redirects
+        # Tool calls share one browser session, so only one of them may drive the login flow at a time
+        async with self.__login_lock:
+            if self.__logged_in:
+                return
+
+            page = await self.__context.new_page()
+            try:
+                await self.__wait_for_login(page)
+            finally:
+                await page.close()
+
+            if self.__logged_in:
+                self.__http = httpx.AsyncClient(
+                    cookies=await self.__session_cookies(),
+                    follow_redirects=True
+                )
+
+    async def __reset_login(self, http: Optional[httpx.AsyncClient]):
+        """Forget the session that ``http`` was created for, unless it has already been replaced."""
+        async with self.__login_lock:
+            if http is not self.__http:
+                # Another call already reset the session that failed for us
+                return
+
+            self.__logged_in = False
+            if self.__http:
+                # Other downloads may still be streaming on this client, so keep it open until exit
+                self.__stale_http.append(self.__http)
+                self.__http = None
+
+    async def __session_cookies(self) -> httpx.Cookies:
+        cookies = httpx.Cookies()
+        for cookie in await self.__context.cookies(Grain.BASE_URL):
+            cookies.set(cookie["name"], cookie["value"], domain=cookie["domain"], path=cookie["path"])
+        return cookies
+
+    async def __open_meetings_page(self, page) -> bool:
+        """Open the meetings page and return whether Grain redirected to the login page."""
+        # The meetings list is rendered client-side, so there is no need to wait for subresources
+        await page.goto(Grain.BASE_URL + Grain.MEETINGS_ENDPOINT, wait_until="domcontentloaded")
+        # Wait until the app either renders the meetings list or redirects to login
+        await page.wait_for_function(
+            "selector => location.href.includes('login') || document.querySelector(selector) !== null",
+            arg=Grain.MEETINGS_LIST_SELECTOR,
+            timeout=30000
+        )
+        return "login" in page.url
 
+    async def __wait_for_login(self, page):
         # Check if we need to log in
-        if "login" in page.url:
+        if await self.__open_meetings_page(page):
             self.__logger.debug("Login page detected. Waiting for manual login.")
 
             # Display helpful message
@@ -39,28 +97,61 @@ class Grain:
                 # Wait for navigation after login
                 await page.wait_for_url(f"**/{Grain.MEETINGS_ENDPOINT}", timeout=300000)  # 5 minutes timeout
                 self.__logger.debug("Login successful!")
+                self.__logged_in = True
             except Exception as e:
                 self.__logger.error(f"Login timeout or error: {str(e)}")
         else:
             self.__logger.debug("Already logged in.")
-
-        await page.close()
+            self.__logged_in = True
 
     async def get_all_meetings(self) -> List[Meeting]:
+        await self.__ensure_logged_in()
+        http = self.__http
+        page_content = await self.__fetch_meetings_list()
+
+        if page_content is None:
+            # The session expired since the last login, show the login page again
+            self.__logger.debug("Redirected to login, logging in again")
+            await self.__reset_login(http)
+            await self.__ensure_logged_in()
+            page_content = await self.__fetch_meetings_list()
+
+        if page_content is None:
+            raise RuntimeError("Grain redirected to the login page after logging in")
+
+        return parse_meetings(page_content)
+
+    async def __ensure_logged_in(self):
         await self.__login()
+        if not self.__logged_in:
+            raise RuntimeError("Not logged in to Grain")
+
+    async def __fetch_meetings_list(self) -> Optional[str]:
+        """Return the meetings list HTML, or None if Grain redirected to the login page."""
         self.__logger.debug(f"Navigating to {Grain.MEETINGS_ENDPOINT}")
 
         page = await self.__context.new_page()
-        await page.goto(Grain.BASE_URL + Grain.MEETINGS_ENDPOINT)
+        try:
+            # Only this page is routed: the login pages keep their images and fonts (e.g. captchas),
+            # and the rest of the context keeps the HTTP cache that routing disables
+            await page.route("**/*", Grain.__block_resources)
+            if await self.__open_meetings_page(page):
+                return None
 
-        self.__logger.debug("Extracting meetings data...")
-        await page.wait_for_load_state("load")
-        self.__logger.debug("Page reached network idle state")
-
-        time.sleep(5)
-        page_content = await page.content()
+            self.__logger.debug("Extracting meetings data...")
+            try:
+                # Returns as soon as the first meeting is rendered
+                await page.locator(Grain.MEETING_ITEM_SELECTOR).first.wait_for(state="attached", timeout=30000)
+            except PlaywrightTimeoutError:
+                self.__logger.warning("No meetings rendered before timeout")
 
-        return parse_meetings(page_content)
+            # Serialize only the meetings list instead of the whole DOM
+            return await page.evaluate(
+                "selector => document.querySelector(selector)?.outerHTML ?? ''",
+                Grain.MEETINGS_LIST_SELECTOR
+            )
+        finally:
+            await page.close()
 
     async def download_meeting_transcript(self, save_path: str, meeting_id: str, transcription_type: str="vtt") -> None:
         await self.__download_file(
@@ -69,49 +160,102 @@ class Grain:
         )
 
     async def __download_file(self, download_url: str, save_path: str) -> None:
-        await self.__login()
+        await self.__ensure_logged_in()
         self.__logger.debug(f"Downloading file {download_url}...")
+
+        http = self.__http
+        # Fetch the file directly with the browser session cookies, no page needed
+        async with http.stream("GET", download_url) as response:
+            # A 403 only means this transcript is not accessible, the session itself is still valid
+            if response.status_code != 401 and "login" not in response.url.path:
+                response.raise_for_status()
+                await Grain.__save_stream(response, save_path)
+
+                self.__logger.debug(f"Saved transcript to {save_path}")
+                return
+
+        # The session cookies are no longer accepted, log in again and download through the browser
+        self.__logger.debug("Session cookies rejected, falling back to browser download")
+        await self.__reset_login(http)
+        await self.__ensure_logged_in()
+
+        await self.__download_file_with_browser(download_url, save_path)
+
+    @staticmethod
+    async def __save_stream(response: httpx.Response, save_path: str) -> None:
+        # Write next to the target and move it into place, so a failed stream never leaves a truncated file.
+        # A plain open keeps the umask file mode, the same as browser downloads
+        temp_path = save_path + ".part"
+        try:
+            with open(temp_path, "wb") as file:
+                async for chunk in response.aiter_bytes(65536):
+                    file.write(chunk)
+            os.replace(temp_path, save_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    async def __download_file_with_browser(self, download_url: str, save_path: str) -> None:
         page = await self.__context.new_page()
+        try:
+            # Start waiting for the download
+            async with page.expect_download() as download_info:
+                try:
+                    # Navigate to the transcript URL to initiate download
+                    # This may throw an error with "net::ERR_ABORTED" which is expected when a download starts
+                    await page.goto(download_url)
+                except PlaywrightError as nav_error:
+                    # Check if this is the expected "net::ERR_ABORTED" error,
+                    # the message is prefixed with the API name, e.g. "Page.goto: net::ERR_ABORTED at ..."
+                    if "net::ERR_ABORTED" in nav_error.message:
+                        self.__logger.debug(
+                            f"Navigation aborted as expected due to download starting")
+                    else:
+                        # If it's a different error, re-raise it
+                        raise nav_error
 
-        # Start waiting for the download
-        async with page.expect_download() as download_info:
-            try:
-                # Navigate to the transcript URL to initiate download
-                # This may throw an error with "net::ERR_ABORTED" which is expected when a download starts
-                await page.goto(download_url)
-            except Exception as nav_error:
-                # Check if this is the expected "net::ERR_ABORTED" error
-                if "net::ERR_ABORTED" in str(nav_error):
-                    self.__logger.debug(
-                        f"Navigation aborted as expected due to download starting")
-                else:
-                    # If it's a different error, re-raise it
-                    raise nav_error
-
-                    # Get the download object
-        download = await download_info.value
-
-        # Wait for the download process to complete and save the file
-        await download.save_as(save_path)
+            # Get the download object
+            download = await download_info.value
+
+            # Wait for the download process to complete and save the file
+            await download.save_as(save_path)
+        finally:
+            await page.close()
 
         self.__logger.debug(f"Saved transcript to {save_path}")
 
     async def __aenter__(self):
-        self.__playwright = await async_playwright().start()
+        if self.__owns_playwright:
+            self.__playwright = await async_playwright().start()
 
         Path(self.__pw_cache_dir).mkdir(parents=True, exist_ok=True)
         self.__context = await self.__playwright.chromium.launch_persistent_context(
             user_data_dir=self.__pw_cache_dir,
-            headless=False,  # Set to True for production use
-            slow_mo=100,  # Slow down operations for better viewing (remove for production)
+            headless=False,  # Login is manual, so the browser window has to be visible
+            slow_mo=100 if self.__debug else 0,  # Slow down operations for better viewing in debug mode
         )
+        self.__context.set_default_navigation_timeout(15000)
         return self
 
+    @staticmethod
+    async def __block_resources(route):
+        if route.request.resource_type in Grain.BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        for http in [self.__http, *self.__stale_http]:
+            if http:
+                await http.aclose()
+        self.__http = None
+        self.__stale_http = []
+
         if self.__context:
             await self.__context.close()
             self.__context = None
 
-        if self.__playwright:
+        if self.__owns_playwright and self.__playwright:
             await self.__playwright.stop()
             self.__playwright = None
\ No newline at end of file
@@ -1,10 +1,15 @@
 import argparse
+import asyncio
 import logging
+import math
 import os
+import time
 import typing
-from dataclasses import asdict
+from contextlib import asynccontextmanager
 
-from fastmcp import FastMCP
+import httpx
+from fastmcp import Context, FastMCP
+from playwright.async_api import async_playwright
 
 from grain_mcp_server.grain import Grain
 
@@ -18,11 +23,51 @@ logger = logging.getLogger("grain-mcp-server")
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 USER_DATA_DIR = os.path.join(BASE_DIR, "user_data")
+DEBUG = False
 
-mcp = FastMCP("Grain")
+def parse_download_concurrency(value: typing.Optional[str], default: int = 8) -> int:
+    """Parse the download concurrency limit, at least 1 and the default for invalid values."""
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return default
+
+def parse_meetings_ttl(value: typing.Optional[str], default: float = 60.0) -> float:
+    """Parse the meetings cache TTL in seconds, at least 0 and the default for invalid values."""
+    try:
+        ttl = float(value)
+    except (TypeError, ValueError):
+        return default
+    if math.isnan(ttl):
+        return default
+    return max(0.0, ttl)
+
+DOWNLOAD_CONCURRENCY = parse_download_concurrency(os.getenv("GRAIN_DL_CONCURRENCY"))
+MEETINGS_TTL = parse_meetings_ttl(os.getenv("GRAIN_MEETINGS_TTL"))
+
+# Last fetched meetings list with the time it was fetched at
+_meetings_cache: typing.Optional[typing.Tuple[float, typing.List[typing.Dict[str, typing.Any]]]] = None
+
+class TranscriptDownload(typing.TypedDict):
+    absolute_save_path: str
+    meeting_id: str
+    transcription_type: typing.Literal["vtt", "srt"]
+
+@asynccontextmanager
+async def grain_lifespan(server: FastMCP) -> typing.AsyncIterator[typing.Dict[str, typing.Any]]:
+    """Keep a single Playwright driver and Grain browser session open for the lifetime of the server."""
+    async with async_playwright() as playwright:
+        async with Grain(os.getenv("USER_DATA_DIR", USER_DATA_DIR), debug=DEBUG, playwright=playwright) as grain:
+            yield {"grain": grain}
+
+mcp = FastMCP("Grain", lifespan=grain_lifespan)
+
+def get_grain(ctx: Context) -> Grain:
+    """Return the Grain session shared by all tool calls."""
+    return ctx.request_context.lifespan_context["grain"]
 
 @mcp.tool()
-async def get_all_meetings() -> typing.List[typing.Dict[str, typing.Any]]:
+async def get_all_meetings(ctx: Context) -> typing.List[typing.Dict[str, typing.Any]]:
     """Retrieve all meeting from Grain.
 
     Fetches a list of all meetings stored in the Grain system, including their
@@ -33,10 +78,17 @@ async def get_all_meetings() -> typing.List[typing.Dict[str, typing.Any]]:
             Each dictionary represents a meeting with its properties.
     """
 
+    global _meetings_cache
+    if _meetings_cache and time.monotonic() - _meetings_cache[0] < MEETINGS_TTL:
+        return _meetings_cache[1]
+
     try:
-        async with Grain(os.getenv("USER_DATA_DIR", USER_DATA_DIR)) as grain:
-            # Get all meetings
-            return [asdict(meeting) for meeting in await grain.get_all_meetings()]
+        # Get all meetings
+        meetings = [meeting.to_dict() for meeting in await get_grain(ctx).get_all_meetings()]
+        # An empty list usually means the page had not rendered yet, so ask again next time
+        if meetings:
+            _meetings_cache = (time.monotonic(), meetings)
+        return meetings
     except Exception as e:
         logger.exception(f"Error running scraper: {str(e)}")
     return []
@@ -45,7 +97,8 @@ async def get_all_meetings() -> typing.List[typing.Dict[str, typing.Any]]:
 async def download_meeting_transcript(
     absolute_save_path: str,
     meeting_id: str,
-    transcription_type: typing.Literal["vtt", "srt"]
+    transcription_type: typing.Literal["vtt", "srt"],
+    ctx: Context
 ) -> bool:
     """Download a meeting transcript from Grain.
 
@@ -61,20 +114,67 @@ async def download_meeting_transcript(
         bool: True if the download was successful, False otherwise
     """
 
-    try:
-        async with Grain(os.getenv("USER_DATA_DIR", USER_DATA_DIR)) as grain:
-            # Download transcript
-            await grain.download_meeting_transcript(
-                save_path=absolute_save_path,
-                meeting_id=meeting_id,
-                transcription_type=transcription_type
+    return await download_transcript(get_grain(ctx), absolute_save_path, meeting_id, transcription_type)
+
+@mcp.tool()
+async def download_meeting_transcripts(
+    downloads: typing.List[TranscriptDownload],
+    ctx: Context
+) -> typing.List[bool]:
+    """Download several meeting transcripts from Grain concurrently.
+
+    Downloads the transcript for each requested meeting in either VTT or SRT format
+    and saves it to the specified location.
+
+    Args:
+        downloads (List[TranscriptDownload]): The transcripts to download, each with
+            an absolute_save_path, a meeting_id and a transcription_type ("vtt" or "srt")
+
+    Returns:
+        List[bool]: For each requested transcript, True if the download was successful, False otherwise
+    """
+
+    grain = get_grain(ctx)
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+    async def download(item: TranscriptDownload) -> bool:
+        async with semaphore:
+            return await download_transcript(
+                grain, item["absolute_save_path"], item["meeting_id"], item["transcription_type"]
             )
 
-            return True
+    return list(await asyncio.gather(*(download(item) for item in downloads)))
+
+async def download_transcript(
+    grain: Grain,
+    absolute_save_path: str,
+    meeting_id: str,
+    transcription_type: str
+) -> bool:
+    """Download a single transcript, reporting failures as False."""
+    try:
+        # Download transcript
+        await grain.download_meeting_transcript(
+            save_path=absolute_save_path,
+            meeting_id=meeting_id,
+            transcription_type=transcription_type
+        )
+
+        return True
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 404:
+            # The meeting is gone, so the cached meetings list is stale
+            invalidate_meetings_cache()
+        logger.exception(f"Error running scraper: {str(e)}")
     except Exception as e:
         logger.exception(f"Error running scraper: {str(e)}")
     return False
 
+def invalidate_meetings_cache() -> None:
+    """Force the next get_all_meetings call to fetch meetings from Grain."""
+    global _meetings_cache
+    _meetings_cache = None
+
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments."""
     parser = argparse.ArgumentParser(description="Grain meetings scraper")
@@ -112,7 +212,8 @@ def main() -> None:
         logger.debug("Debug mode enabled")
     #
     # Use custom user data directory if provided
-    global USER_DATA_DIR
+    global USER_DATA_DIR, DEBUG
+    DEBUG = args.debug
     USER_DATA_DIR = args.user_data_dir if args.user_data_dir else USER_DATA_DIR
 
     mcp.run(transport="stdio")
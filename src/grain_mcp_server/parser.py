@@ -1,63 +1,165 @@
 from dataclasses import dataclass
+import functools
 import re
 import logging
-from typing import List, Optional
-from bs4 import BeautifulSoup
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from lxml import etree
 from datetime import datetime
 
 logger = logging.getLogger("grain-mcp-server")
 
-@dataclass
+# Meeting ID from URL pattern: https://grain.com/share/recording/{meeting_id}/...
+_RECORDING_RE = re.compile(r'recordings?/([^/]+)')
+# Date format like "Apr, 23rd 3:03 PM \u00b7 1h 37m"
+_GRAIN_DATE_RE = re.compile(r'([A-Za-z]+),\s+(\d+)(?:st|nd|rd|th)?\s+(\d+):(\d+)\s+(AM|PM)', re.IGNORECASE)
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+# Month numbers by the first three letters of the month name
+_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+# Compiled once, the searches run inside libxml2
+_IN_MEETINGS_LIST_XPATH = etree.XPath("boolean(ancestor::div[@id='infinite-scrollable-div'])")
+_TITLE_XPATH = etree.XPath("(.//h3)[1]")
+_DATE_XPATH = etree.XPath("(.//h3)[1]/../following-sibling::*[1]")
+# Number of characters handed to the HTML parser at a time
+_FEED_CHUNK_SIZE = 65536
+
+@dataclass(slots=True, frozen=True)
 class Meeting:
     id: str
     title: str
     url: str
     date: Optional[str] # ISO format
 
-def parse_meetings(html_content: str) -> List[Meeting]:
-    """Extract meeting data from HTML content using BeautifulSoup.
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        """Return the meeting as a plain dictionary, without the deep copy done by dataclasses.asdict."""
+        return {"id": self.id, "title": self.title, "url": self.url, "date": self.date}
+
+def parse_meetings(html_content: str, *, _now: Callable[[], datetime] = datetime.now) -> List[Meeting]:
+    """Extract meeting data from HTML content, streaming it through lxml.
+
+    The HTML string is fed to the parser in slices instead of being encoded as a whole.
+    Meeting items are read as soon as the parser reaches their end tag and are then
+    released together with the list items before them, which keeps the parsed tree
+    small. The HTML string itself stays in memory for the whole call.
 
     Args:
         html_content: HTML content of the page
+        _now: Returns the current date, can be replaced in tests
 
     Returns:
         List of meeting dictionaries with title, date, id, and url
     """
+    if not html_content:
+        return []
 
-    # Parse the HTML content
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    # Find the div with id=infinite-scrollable-div
-    scrollable_div = soup.find(id='infinite-scrollable-div')
+    # Collect the raw fields of every meeting while streaming, and build the meetings afterwards
+    urls: List[Optional[str]] = []
+    titles: List[Optional[str]] = []
+    date_texts: List[Optional[str]] = []
+    years: List[int] = []
+    # Dates without a year header are in the current year, look it up once for the whole page
+    current_year = _now().year
+    section, year = None, current_year
+
+    for item in iter_parsed_elements(html_content, 'a'):
+        # Only meeting items inside the div with id=infinite-scrollable-div
+        if item.get('role') != 'article' or item.get('data-cy') != 'meeting-list-item':
+            continue
+        if not _IN_MEETINGS_LIST_XPATH(item):
+            continue
+
+        # Carry the latest year header down to the meetings below it, within a list section
+        parent = item.getparent()
+        if parent is not section:
+            section, year = parent, current_year
+
+        # Only the headers since the previous meeting are still in the tree, the closest one wins
+        for sibling in item.itersiblings('div', preceding=True):
+            header_year = parse_year(sibling)
+            if header_year:
+                year = header_year
+                break
 
-    if not scrollable_div:
-        return []
+        url, title, date_text = extract_meeting_fields(item)
+        urls.append(url)
+        titles.append(title)
+        date_texts.append(date_text)
+        years.append(year)
 
-    # Try to find meeting items with specific attributes based on the HTML example
-    meeting_items = scrollable_div.find_all('a', attrs={'role': 'article', 'data-cy': 'meeting-list-item'})
+        # Release the parsed meeting and everything before it in its section
+        item.clear(keep_tail=True)
+        while item.getprevious() is not None:
+            del parent[0]
 
-    logger.info(f"Found {len(meeting_items)} meeting items")
+    logger.info(f"Found {len(urls)} meeting items")
 
-    # Extract data from each meeting item
     meetings = []
-    for item in meeting_items:
+    for url, title, date_text, year in zip(urls, titles, date_texts, years):
         try:
-            meetings.append(parse_meeting_data(item))
+            meetings.append(build_meeting(url, title, date_text, year))
         except ValueError as e:
             logger.error(f"Error parsing meeting data: {e}")
 
     return meetings
 
-def parse_meeting_data(item) -> Meeting:
-    """Extract data from a meeting item."""
-    # Based on the HTML example, look for specific classes first
-    title_el = item.find('h3')
-    meeting_title = get_text_content(title_el)
+def iter_parsed_elements(html_content: str, tag: str) -> Iterator[etree._Element]:
+    """Yield the elements with the given tag as the HTML parser reaches their end tag."""
+    parser = etree.HTMLPullParser(events=('end',), tag=tag)
+    for start in range(0, len(html_content), _FEED_CHUNK_SIZE):
+        parser.feed(html_content[start:start + _FEED_CHUNK_SIZE])
+        for _, element in parser.read_events():
+            yield element
+
+    parser.close()
+    for _, element in parser.read_events():
+        yield element
+
+def parse_year(element) -> Optional[int]:
+    """Extract year information from a list element such as a date header."""
+    # Scan the text nodes directly and stop at the first one with a year,
+    # rather than joining all the element's text first
+    for text in element.itertext():
+        year_match = _YEAR_RE.search(text)
+        if year_match:
+            year = int(year_match.group(1))
+            logger.info(f"Found year {year} in sibling element")
+            return year
+    return None
+
+def parse_meeting_data(item, year: Optional[int] = None) -> Meeting:
+    """Extract data from a meeting item.
+
+    Args:
+        item: The meeting list item element
+        year: The year the meeting took place in, the current year if not provided
+    """
+    return build_meeting(*extract_meeting_fields(item), year=year)
+
+def extract_meeting_fields(item) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Extract the raw URL, title and date text from a meeting item."""
+    return (
+        item.get('href'),
+        get_text_content(first_or_none(_TITLE_XPATH(item))),
+        get_text_content(first_or_none(_DATE_XPATH(item)))
+    )
+
+def build_meeting(
+    meeting_url: Optional[str],
+    meeting_title: Optional[str],
+    date_text: Optional[str],
+    year: Optional[int] = None
+) -> Meeting:
+    """Build a meeting from the raw fields of a meeting item.
+
+    Raises:
+        ValueError: If the title, URL or meeting ID is missing
+    """
     if meeting_title is None:
         raise ValueError("No title found for meeting")
 
-    # Get the URL from the link element
-    meeting_url: Optional[str] = item.get('href')
     if meeting_url is None:
         raise ValueError("No URL found for meeting")
 
@@ -65,25 +167,7 @@ def parse_meeting_data(item) -> Meeting:
     if meeting_id is None:
         raise ValueError("No ID found for meeting")
 
-    # Look for year information in sibling elements
-    year = None
-
-    # Check previous sibling elements for year information
-    sibling = item.find_previous_sibling(name='div')
-    while sibling and not year:
-        sibling_text = get_text_content(sibling)
-        if sibling_text:
-            year_match = re.search(r'\b(20\d{2})\b', sibling_text)
-            if year_match:
-                year = int(year_match.group(1))
-                logger.info(f"Found year {year} in sibling element")
-                break
-        sibling = sibling.find_previous_sibling(name='div')
-
-    meeting_date = parse_date_to_iso(
-        date_str=get_text_content(title_el.parent.find_next_sibling()),
-        year=year
-    )
+    meeting_date = parse_date_to_iso(date_str=date_text, year=year)
 
     return Meeting(
         id=meeting_id,
@@ -92,25 +176,32 @@ def parse_meeting_data(item) -> Meeting:
         url=meeting_url
     )
 
+def first_or_none(elements: list):
+    """Return the first result of an XPath query, or None if nothing matched."""
+    return elements[0] if elements else None
+
 def get_text_content(element) -> Optional[str]:
-    """Extract text content from a BeautifulSoup element."""
+    """Extract text content from an lxml element, stripping each text fragment."""
     if element is None:
         return None
-    return element.get_text(strip=True)
+    return "".join(text.strip() for text in element.itertext())
 
-def parse_meeting_id(url: str) -> Optional[str]:
+# The same recording URLs show up again every time the meetings list is fetched
+@functools.lru_cache(maxsize=4096)
+def parse_meeting_id(url: Optional[str]) -> Optional[str]:
     """Extract meeting ID from URL."""
-
-    # Extract meeting ID from URL pattern: https://grain.com/share/recording/{meeting_id}/...
-    recording_pattern = r'recordings?/([^/]+)'
-    match = re.search(recording_pattern, url)
-
-    if match and match.group(1):
-        return match.group(1)
-    else:
+    if not url:
         return None
 
-def parse_date_to_iso(date_str: Optional[str], year: Optional[int] = None) -> Optional[str]:
+    match = _RECORDING_RE.search(url)
+    return match.group(1) if match else None
+
+def parse_date_to_iso(
+    date_str: Optional[str],
+    year: Optional[int] = None,
+    *,
+    _now: Callable[[], datetime] = datetime.now
+) -> Optional[str]:
     """Convert various date formats to ISO format.
 
     Handles formats like:
@@ -120,6 +211,7 @@ def parse_date_to_iso(date_str: Optional[str], year: Optional[int] = None) -> Op
         date_str (str): The date string to convert
         year (int, optional): The year to use when parsing dates that don't include a year.
                              If not provided, the current year will be used.
+        _now (callable, optional): Returns the current date, can be replaced in tests.
 
     Returns:
         str: Date in ISO format, or original string if parsing fails
@@ -132,35 +224,23 @@ def parse_date_to_iso(date_str: Optional[str], year: Optional[int] = None) -> Op
         clean_date_str = date_str.strip()
 
         # Handle format like "Apr, 23rd 3:03 PM \u00b7 1h 37m"
-        grain_date_pattern = (
-            r'([A-Za-z]+),\s+(\d+)(?:st|nd|rd|th)?\s+(\d+):(\d+)\s+(AM|PM)'
-        )
-        grain_date_match = re.match(grain_date_pattern, clean_date_str, re.IGNORECASE)
+        grain_date_match = _GRAIN_DATE_RE.match(clean_date_str)
         if grain_date_match:
-            month_str = grain_date_match.group(1)
-            day = int(grain_date_match.group(2))
-            hours = int(grain_date_match.group(3))
-            minutes = int(grain_date_match.group(4))
-            ampm = grain_date_match.group(5).upper()
+            month_str, day, hours, minutes, ampm = grain_date_match.groups()
 
             # Convert month name to month number (1-12)
-            months = {
-                'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-                'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
-            }
-
-            month_key = month_str.lower()[:3]
-            month = months.get(month_key, 1)  # Default to January if not found
+            month = _MONTHS.get(month_str[:3].lower())
+            if month is None:
+                raise ValueError(f"Unknown month {month_str}")
 
-            # Adjust hours for PM
-            if ampm == 'PM' and hours < 12:
+            # Convert the 12-hour clock to 24 hours
+            hours = int(hours) % 12
+            if ampm.upper() == 'PM':
                 hours += 12
-            if ampm == 'AM' and hours == 12:
-                hours = 0
 
             # Use the provided year if available, otherwise use current year
-            use_year = year if year is not None else datetime.now().year
-            date_obj = datetime(use_year, month, day, hours, minutes, 0)
+            use_year = year if year is not None else _now().year
+            date_obj = datetime(use_year, month, int(day), hours, int(minutes))
 
             return date_obj.isoformat()
 
@@ -0,0 +1,101 @@
+import asyncio
+import os
+import stat
+
+import httpx
+import pytest
+
+from grain_mcp_server.grain import Grain
+
+
+def transcript_handler(request):
+    meeting_id = request.url.path.split("/")[-2]
+    if meeting_id == "expired":
+        return httpx.Response(401)
+    if meeting_id == "redirected":
+        return httpx.Response(302, headers={"Location": "https://grain.com/login"})
+    if request.url.path == "/login":
+        return httpx.Response(200, text="<html>Log in</html>")
+    if meeting_id == "private":
+        return httpx.Response(403)
+    if meeting_id == "gone":
+        return httpx.Response(404)
+    return httpx.Response(200, content=b"WEBVTT\n")
+
+
+class StubbedGrain:
+    """Grain logged in through an httpx.MockTransport, with the browser replaced by stubs."""
+
+    def __init__(self, tmp_path):
+        self.grain = Grain(str(tmp_path / "user_data"))
+        self.logins = 0
+        self.browser_downloads = []
+        self.grain._Grain__logged_in = True
+        self.grain._Grain__http = StubbedGrain.make_client()
+        self.grain._Grain__login = self.login
+        self.grain._Grain__download_file_with_browser = self.download_with_browser
+
+    @staticmethod
+    def make_client():
+        return httpx.AsyncClient(transport=httpx.MockTransport(transcript_handler), follow_redirects=True)
+
+    async def login(self):
+        if not self.grain._Grain__logged_in:
+            self.logins += 1
+            self.grain._Grain__logged_in = True
+            self.grain._Grain__http = StubbedGrain.make_client()
+
+    async def download_with_browser(self, download_url, save_path):
+        self.browser_downloads.append(download_url)
+        with open(save_path, "wb") as file:
+            file.write(b"WEBVTT from browser\n")
+
+    async def download(self, meeting_id, save_path):
+        try:
+            await self.grain.download_meeting_transcript(str(save_path), meeting_id)
+        finally:
+            await self.grain.__aexit__(None, None, None)
+
+
+class TestGrain:
+    def test_download_transcript(self, tmp_path):
+        stubbed = StubbedGrain(tmp_path)
+        save_path = tmp_path / "ok.vtt"
+
+        asyncio.run(stubbed.download("ok", save_path))
+
+        assert save_path.read_bytes() == b"WEBVTT\n"
+        assert not os.path.exists(f"{save_path}.part")
+        assert stubbed.logins == 0
+        assert stubbed.browser_downloads == []
+
+        # Test that the file mode follows the umask like browser downloads do
+        umask = os.umask(0)
+        os.umask(umask)
+        assert stat.S_IMODE(os.stat(save_path).st_mode) == 0o666 & ~umask
+
+    @pytest.mark.parametrize("meeting_id", ["expired", "redirected"])
+    def test_download_transcript_with_rejected_session(self, tmp_path, meeting_id):
+        stubbed = StubbedGrain(tmp_path)
+        save_path = tmp_path / f"{meeting_id}.vtt"
+
+        asyncio.run(stubbed.download(meeting_id, save_path))
+
+        # The session is renewed and the transcript is downloaded through the browser
+        assert stubbed.logins == 1
+        assert stubbed.browser_downloads == [f"https://grain.com/_/cc/recording/{meeting_id}/transcript.vtt"]
+        assert save_path.read_bytes() == b"WEBVTT from browser\n"
+
+    @pytest.mark.parametrize("meeting_id, status_code", [("private", 403), ("gone", 404)])
+    def test_download_transcript_with_error_status(self, tmp_path, meeting_id, status_code):
+        stubbed = StubbedGrain(tmp_path)
+        save_path = tmp_path / f"{meeting_id}.vtt"
+
+        with pytest.raises(httpx.HTTPStatusError) as error:
+            asyncio.run(stubbed.download(meeting_id, save_path))
+
+        # The session is still valid, so it is kept and nothing is written
+        assert error.value.response.status_code == status_code
+        assert stubbed.logins == 0
+        assert stubbed.browser_downloads == []
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,164 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from grain_mcp_server import main
+from grain_mcp_server.main import (
+    download_meeting_transcript,
+    download_meeting_transcripts,
+    get_all_meetings,
+    parse_download_concurrency,
+    parse_meetings_ttl
+)
+
+
+class StubGrain:
+    """Stands in for the shared Grain session, without a browser."""
+
+    # Earlier meetings take longer, so concurrent downloads finish in reverse order
+    DELAYS = {"a": 0.03, "b": 0.02, "c": 0.01}
+
+    def __init__(self, failing_meeting_ids=(), missing_meeting_ids=(), meetings=()):
+        self.failing_meeting_ids = set(failing_meeting_ids)
+        self.missing_meeting_ids = set(missing_meeting_ids)
+        self.meetings = list(meetings)
+        self.downloaded = []
+        self.meetings_calls = 0
+
+    async def get_all_meetings(self):
+        self.meetings_calls += 1
+        return self.meetings
+
+    async def download_meeting_transcript(self, save_path, meeting_id, transcription_type="vtt"):
+        await asyncio.sleep(StubGrain.DELAYS[meeting_id])
+        if meeting_id in self.failing_meeting_ids:
+            raise RuntimeError(f"Download of {meeting_id} failed")
+        if meeting_id in self.missing_meeting_ids:
+            request = httpx.Request("GET", f"https://grain.com/_/public-api/recordings/{meeting_id}")
+            response = httpx.Response(404, request=request)
+            raise httpx.HTTPStatusError("Not Found", request=request, response=response)
+        self.downloaded.append(meeting_id)
+
+
+class StubMeeting:
+    def __init__(self, meeting_id):
+        self.meeting_id = meeting_id
+
+    def to_dict(self):
+        return {"id": self.meeting_id}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_context(grain):
+    return SimpleNamespace(request_context=SimpleNamespace(lifespan_context={"grain": grain}))
+
+
+def make_download(meeting_id):
+    return {
+        "absolute_save_path": f"/tmp/{meeting_id}.vtt",
+        "meeting_id": meeting_id,
+        "transcription_type": "vtt"
+    }
+
+
+@pytest.fixture(autouse=True)
+def empty_meetings_cache(monkeypatch):
+    monkeypatch.setattr(main, "_meetings_cache", None)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    # Only main's view of the clock is replaced, asyncio keeps the real one
+    monkeypatch.setattr(main, "time", SimpleNamespace(monotonic=fake_clock))
+    monkeypatch.setattr(main, "MEETINGS_TTL", 60.0)
+    return fake_clock
+
+
+class TestMain:
+    def test_parse_download_concurrency(self):
+        assert parse_download_concurrency("4") == 4
+        assert parse_download_concurrency(None) == 8
+
+        # Test values that would hang or crash the server
+        assert parse_download_concurrency("0") == 1
+        assert parse_download_concurrency("-3") == 1
+        assert parse_download_concurrency("many") == 8
+
+    def test_parse_meetings_ttl(self):
+        assert parse_meetings_ttl("30") == 30.0
+        assert parse_meetings_ttl("0") == 0.0
+        assert parse_meetings_ttl(None) == 60.0
+
+        # Test values that would crash the server or silently disable the cache
+        assert parse_meetings_ttl("60s") == 60.0
+        assert parse_meetings_ttl("nan") == 60.0
+        assert parse_meetings_ttl("-5") == 0.0
+
+    def test_download_meeting_transcripts(self):
+        grain = StubGrain(failing_meeting_ids={"b"})
+        downloads = [make_download(meeting_id) for meeting_id in ("a", "b", "c")]
+
+        results = asyncio.run(download_meeting_transcripts(downloads, make_context(grain)))
+
+        # Results keep the request order even though the downloads finished in reverse
+        assert results == [True, False, True]
+        assert grain.downloaded == ["c", "a"]
+
+    def test_download_meeting_transcripts_respects_concurrency(self, monkeypatch):
+        monkeypatch.setattr(main, "DOWNLOAD_CONCURRENCY", 1)
+        grain = StubGrain()
+        downloads = [make_download(meeting_id) for meeting_id in ("a", "b", "c")]
+
+        results = asyncio.run(download_meeting_transcripts(downloads, make_context(grain)))
+
+        # With a single slot the downloads run one after another, in request order
+        assert results == [True, True, True]
+        assert grain.downloaded == ["a", "b", "c"]
+
+    def test_get_all_meetings_cache_ttl(self, clock):
+        grain = StubGrain(meetings=[StubMeeting("a")])
+        ctx = make_context(grain)
+
+        assert asyncio.run(get_all_meetings(ctx)) == [{"id": "a"}]
+        clock.now += 59
+        assert asyncio.run(get_all_meetings(ctx)) == [{"id": "a"}]
+        assert grain.meetings_calls == 1
+
+        # Test that the list is fetched again once the TTL has expired
+        clock.now += 1
+        asyncio.run(get_all_meetings(ctx))
+        assert grain.meetings_calls == 2
+
+    def test_get_all_meetings_does_not_cache_empty_list(self, clock):
+        grain = StubGrain()
+        ctx = make_context(grain)
+
+        assert asyncio.run(get_all_meetings(ctx)) == []
+        grain.meetings = [StubMeeting("a")]
+        assert asyncio.run(get_all_meetings(ctx)) == [{"id": "a"}]
+        assert grain.meetings_calls == 2
+
+    def test_missing_transcript_invalidates_meetings_cache(self, clock):
+        grain = StubGrain(missing_meeting_ids={"a"}, meetings=[StubMeeting("a")])
+        ctx = make_context(grain)
+        asyncio.run(get_all_meetings(ctx))
+
+        # Test that a failure other than 404 keeps the cache
+        grain.failing_meeting_ids = {"b"}
+        assert asyncio.run(download_meeting_transcript("/tmp/b.vtt", "b", "vtt", ctx)) is False
+        asyncio.run(get_all_meetings(ctx))
+        assert grain.meetings_calls == 1
+
+        assert asyncio.run(download_meeting_transcript("/tmp/a.vtt", "a", "vtt", ctx)) is False
+        asyncio.run(get_all_meetings(ctx))
+        assert grain.meetings_calls == 2
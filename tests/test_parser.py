@@ -1,7 +1,8 @@
 from datetime import datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
-from bs4 import BeautifulSoup
+import pytest
+from lxml import html
 
 # Import the parser module
 from grain_mcp_server.parser import (
@@ -87,19 +88,27 @@ SAMPLE_HTML = """
 </div>
 """
 
+@pytest.fixture(scope="module")
+def sample_document():
+    """SAMPLE_HTML parsed once and shared by the tests in this module."""
+    return html.fromstring(SAMPLE_HTML)
+
+@pytest.fixture(scope="module")
+def sample_meetings():
+    """Meetings parsed once from SAMPLE_HTML and shared by the tests in this module."""
+    return parse_meetings(SAMPLE_HTML)
+
 class TestParser:
     def test_get_text_content(self):
         # Test with a valid element
-        soup = BeautifulSoup("<div>Test Content</div>", "html.parser")
-        element = soup.find("div")
+        element = html.fromstring("<div>Test Content</div>")
         assert get_text_content(element) == "Test Content"
 
         # Test with None
         assert get_text_content(None) is None
 
         # Test with empty element
-        soup = BeautifulSoup("<div></div>", "html.parser")
-        element = soup.find("div")
+        element = html.fromstring("<div></div>")
         assert get_text_content(element) == ""
 
     def test_parse_meeting_id(self):
@@ -124,31 +133,15 @@ class TestParser:
         # Test with valid date string
         date_str = "Mar, 15th 2:30 PM"
 
-        # Create a mock datetime object that returns a specific isoformat
-        mock_date = MagicMock()
-        mock_date.isoformat.return_value = "2024-03-15T14:30:00"
-
-        # Use a fixed year for testing and return our mock date object
-        with patch('grain_mcp_server.parser.datetime', autospec=True) as mock_datetime:
-            mock_datetime.now.return_value = datetime(2024, 1, 1)
-            # Make datetime constructor return our mock
-            mock_datetime.side_effect = lambda *args, **kwargs: mock_date if len(args) > 3 else datetime(*args, **kwargs)
+        # Test without a year, the current year is used
+        assert parse_date_to_iso(date_str, _now=lambda: datetime(2024, 1, 1)) == "2024-03-15T14:30:00"
 
-            result = parse_date_to_iso(date_str)
-            assert result == "2024-03-15T14:30:00"
+        # Test with provided year
+        assert parse_date_to_iso(date_str, year=2023) == "2023-03-15T14:30:00"
 
-        # Test with provided year - using a different approach with direct patching of datetime constructor
-        with patch('grain_mcp_server.parser.datetime', autospec=True) as mock_datetime:
-            # Create a real datetime object for the .now() call
-            mock_datetime.now.return_value = datetime(2023, 1, 1)
-
-            # Create a mock for the datetime constructor that returns an object with isoformat method
-            mock_date_obj = MagicMock()
-            mock_date_obj.isoformat.return_value = "2023-03-15T14:30:00"
-            mock_datetime.side_effect = lambda *args, **kwargs: mock_date_obj if len(args) > 3 else datetime(*args, **kwargs)
-
-            result = parse_date_to_iso(date_str, year=2023)
-            assert result == "2023-03-15T14:30:00"
+        # Test AM/PM edge cases and trailing duration text
+        assert parse_date_to_iso("Apr, 23rd 12:05 AM", year=2024) == "2024-04-23T00:05:00"
+        assert parse_date_to_iso("Apr, 23rd 12:05 PM · 1h 37m", year=2024) == "2024-04-23T12:05:00"
 
         # Test with None
         assert parse_date_to_iso(None) is None
@@ -156,9 +149,8 @@ class TestParser:
         # Test with invalid date string
         assert parse_date_to_iso("Invalid date") is None
 
-    def test_parse_meeting_data(self):
-        soup = BeautifulSoup(SAMPLE_HTML, "html.parser")
-        meeting_item = soup.find("a", attrs={"role": "article", "data-cy": "meeting-list-item"})
+    def test_parse_meeting_data(self, sample_document):
+        meeting_item = sample_document.xpath("//a[@role='article' and @data-cy='meeting-list-item']")[0]
 
         # Mock the parse_date_to_iso function to return a fixed date
         with patch('grain_mcp_server.parser.parse_date_to_iso', return_value="2024-03-15T14:30:00"):
@@ -170,9 +162,16 @@ class TestParser:
             assert meeting.url == "/share/recording/abc123-456-789/xyz987"
             assert meeting.date == "2024-03-15T14:30:00"
 
-    def test_parse_meetings(self):
+            assert meeting.to_dict() == {
+                "id": "abc123-456-789",
+                "title": "Project Alpha Weekly Meeting",
+                "url": "/share/recording/abc123-456-789/xyz987",
+                "date": "2024-03-15T14:30:00"
+            }
+
+    def test_parse_meetings(self, sample_meetings):
         # Test with valid HTML
-        meetings = parse_meetings(SAMPLE_HTML)
+        meetings = sample_meetings
 
         assert len(meetings) == 3
         assert all(isinstance(meeting, Meeting) for meeting in meetings)
@@ -197,3 +196,20 @@ class TestParser:
 
         # Test with HTML that has the scrollable div but no meetings
         assert parse_meetings('<div id="infinite-scrollable-div"></div>') == []
+
+    def test_parse_meetings_in_small_slices(self, sample_meetings):
+        # Meetings split across the slices fed to the parser are parsed the same way
+        with patch("grain_mcp_server.parser._FEED_CHUNK_SIZE", 7):
+            assert parse_meetings(SAMPLE_HTML) == sample_meetings
+
+    def test_parse_meetings_with_year_header(self):
+        # The year from a date header applies to every meeting below it in the same section
+        html_content = SAMPLE_HTML.replace("Wednesday, Mar 15th", "Wednesday, Mar 15th, 2023")
+
+        meetings = parse_meetings(html_content, _now=lambda: datetime(2024, 1, 1))
+
+        assert len(meetings) == 3
+        assert meetings[0].date == "2023-03-15T14:30:00"
+        assert meetings[1].date == "2023-03-15T13:15:00"
+        # Meetings without a year header fall back to the pinned current year
+        assert meetings[2].date == "2024-03-14T15:00:00"